@@ -8,11 +8,16 @@ import ckan.model as model
 import ckan.plugins as p
 import requests
 from ckan.logic import get_action
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ckanext.dcat.harvesters.rdf import DCATRDFHarvester
 from ckanext.dcat.interfaces import IDCATRDFHarvester
 from ckanext.dcat.processors import RDFParserException
+from ckanext.harvest.model import HarvestObject
 from ckanext.stadtzh_losdharvest.processors import LosdViewsParser
+from ckanext.stadtzh_losdharvest.profiling import DEFAULT_TOP_N, LosdProfiler
+from ckanext.stadtzh_losdharvest.utils import compact_payload, expand_payload
 
 log = logging.getLogger(__name__)
 
@@ -40,12 +45,79 @@ class StadtzhLosdHarvester(DCATRDFHarvester):
             source_config_obj["rdf_format"] = "text/turtle"
             source_config = json.dumps(source_config_obj)
 
+        if "profiling" in source_config_obj:
+            if not isinstance(source_config_obj["profiling"], bool):
+                raise ValueError("profiling must be a boolean")
+
+        if "profiling_top_n" in source_config_obj:
+            top_n = source_config_obj["profiling_top_n"]
+            if isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 1:
+                raise ValueError("profiling_top_n must be a positive integer")
+
         return super(StadtzhLosdHarvester, self).validate_config(source_config)
 
     def update_session(self, session):
         session.headers.update({"Accept": "text/turtle"})
         return session
 
+    def gather_stage(self, harvest_job):
+        """
+        Overwritten from DCATRDFHarvester to store the content of the gathered
+        harvest objects in a compact format. The full dataset dicts (including
+        notes, sszFields and resources) would otherwise make the harvest tables
+        grow quickly.
+
+        The content is compressed just before each harvest object of this job is
+        inserted, so every object is only written once.
+        """
+
+        def compact_content(mapper, connection, harvest_object):
+            if harvest_object.harvest_job_id == harvest_job.id:
+                harvest_object.content = compact_payload(harvest_object.content)
+
+        event.listen(HarvestObject, "before_insert", compact_content)
+        try:
+            return self._profiled_gather_stage(harvest_job)
+        finally:
+            event.remove(HarvestObject, "before_insert", compact_content)
+
+    def _profiled_gather_stage(self, harvest_job):
+        """
+        Run the gather stage of DCATRDFHarvester. If profiling is enabled in the
+        harvest source config, the parsing of all pages of the source is profiled
+        and a report is logged at the end of the gather stage, even if it fails.
+        """
+        source_config = self._get_source_config(harvest_job)
+        if not source_config.get("profiling"):
+            return super(StadtzhLosdHarvester, self).gather_stage(harvest_job)
+
+        profiler = LosdProfiler(
+            top_n=source_config.get("profiling_top_n", DEFAULT_TOP_N)
+        )
+        try:
+            with profiler:
+                return super(StadtzhLosdHarvester, self).gather_stage(harvest_job)
+        finally:
+            log.info(
+                f"Profiling report for harvest job {harvest_job.id}:\n"
+                f"{profiler.report()}"
+            )
+
+    def import_stage(self, harvest_object):
+        """
+        Overwritten from DCATRDFHarvester to expand the compacted content of the
+        harvest object before importing it.
+
+        The expanded content is only set as the committed value of the object, so
+        that it is not written back to the database when the session is flushed.
+        """
+        if harvest_object.content is not None:
+            set_committed_value(
+                harvest_object, "content", expand_payload(harvest_object.content)
+            )
+
+        return super(StadtzhLosdHarvester, self).import_stage(harvest_object)
+
     def _is_published(self, dataset):
         """Return True if the dataset has a dateFirstPublished in the past.
         This value is mapped from the attribute dcterms:issued.
@@ -91,6 +163,11 @@ class StadtzhLosdHarvester(DCATRDFHarvester):
 
         return rdf_parser, []
 
+    def _get_source_config(self, harvest_job):
+        if not harvest_job.source.config:
+            return {}
+        return json.loads(harvest_job.source.config)
+
     def after_create(self, harvest_object, dataset_dict, temp_dict):
         log.debug("In StadtzhLosdHarvester after_create")
         self._touch_resources(dataset_dict)
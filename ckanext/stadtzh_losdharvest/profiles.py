@@ -2,6 +2,7 @@
 
 import json
 import logging
+from collections import namedtuple
 
 import isodate
 import rdflib
@@ -60,6 +61,17 @@ namespaces = {
     "skos": SKOS,
 }
 
+# For some reason, DCTERMS.format does not work so we have to use the explicit
+# URIRef here.
+DCTERMS_FORMAT = rdflib.term.URIRef("http://purl.org/dc/terms/format")
+
+Distribution = namedtuple("Distribution", ["url", "format", "mimetype"])
+
+# Attribute of the graph that holds the distributions of all datasets in the
+# graph. A new profile is created for every dataset in the graph, so the index
+# is kept on the graph itself.
+DISTRIBUTION_INDEX_ATTR = "_stadtzh_losd_distribution_index"
+
 LICENSE_MAPPING_FOR_LOSD = {
     rdflib.term.URIRef("http://creativecommons.org/licenses/by/3.0/"): "cc-by"
 }
@@ -211,36 +223,55 @@ class StadtzhLosdDcatProfile(RDFProfile):
         DCATRDFHarvester import_stage, the resource URI is used to identify resources
         that already exist on a dataset.
         """
-        resource_list = []
-        for resource_ref in self.g.objects(dataset_ref, DCAT.distribution):
-            resource_dict = {}
-            # For some reason, DCTERMS.format does not work so we have to
-            # use the explicit URIRef here.
-            for key, predicate in (
-                ("url", DCAT.downloadURL),
-                ("uri", DCAT.downloadURL),
-                (
-                    "format",
-                    rdflib.term.URIRef("http://purl.org/dc/terms/format"),
-                ),
-                ("mimetype", DCAT.mediaType),
-            ):
-                value = self._object_value(resource_ref, predicate)
-                if value:
-                    resource_dict[key] = value
-            if not resource_dict.get("name"):
-                resource_dict["name"] = dataset_dict["name"]
-
-            if "csv" in resource_dict.get("mimetype", ""):
-                resource_dict["url_type"] = "file"
-                resource_dict["resource_type"] = "file"
-            else:
-                resource_dict["url_type"] = "api"
-                resource_dict["resource_type"] = "api"
-
-            resource_list.append(resource_dict)
+        return [
+            self._build_resource_dict(distribution, dataset_dict)
+            for distribution in self._get_distribution_index().get(dataset_ref, [])
+        ]
 
-        return resource_list
+    def _build_resource_dict(self, distribution, dataset_dict):
+        resource_dict = {}
+        for key, value in (
+            ("url", distribution.url),
+            ("uri", distribution.url),
+            ("format", distribution.format),
+            ("mimetype", distribution.mimetype),
+        ):
+            if value:
+                resource_dict[key] = value
+        resource_dict["name"] = dataset_dict["name"]
+
+        if "csv" in resource_dict.get("mimetype", ""):
+            resource_dict["url_type"] = "file"
+            resource_dict["resource_type"] = "file"
+        else:
+            resource_dict["url_type"] = "api"
+            resource_dict["resource_type"] = "api"
+
+        return resource_dict
+
+    def _get_distribution_index(self):
+        """Get the distributions of all datasets in the graph, indexed by
+        dataset ref. The index is built on the first call for each graph, and
+        built again if the number of triples in the graph has changed.
+        """
+        graph_size, index = getattr(self.g, DISTRIBUTION_INDEX_ATTR, (None, None))
+        if graph_size != len(self.g):
+            index = self._build_distribution_index()
+            setattr(self.g, DISTRIBUTION_INDEX_ATTR, (len(self.g), index))
+        return index
+
+    def _build_distribution_index(self):
+        index = {}
+        for dataset_ref, distribution_ref in self.g.subject_objects(DCAT.distribution):
+            url = self._object_value(distribution_ref, DCAT.downloadURL)
+            index.setdefault(dataset_ref, []).append(
+                Distribution(
+                    url=url,
+                    format=self._object_value(distribution_ref, DCTERMS_FORMAT),
+                    mimetype=self._object_value(distribution_ref, DCAT.mediaType),
+                )
+            )
+        return index
 
     def _objects_from_losd_predicate(self, ref, predicate_name):
         """Get the objects with this subject and predicate name, where
@@ -0,0 +1,123 @@
+# coding=utf-8
+import functools
+import logging
+import time
+import tracemalloc
+
+from ckanext.stadtzh_losdharvest import profiles
+from ckanext.stadtzh_losdharvest.profiles import StadtzhLosdDcatProfile
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TOP_N = 20
+
+# The profile methods and module functions that are timed while profiling.
+PROFILED_CALLABLES = (
+    (StadtzhLosdDcatProfile, "parse_dataset"),
+    (StadtzhLosdDcatProfile, "_get_publisher_for_dataset_ref"),
+    (StadtzhLosdDcatProfile, "_get_groups_for_dataset_ref"),
+    (StadtzhLosdDcatProfile, "_get_attributes"),
+    (StadtzhLosdDcatProfile, "_build_resources_dict"),
+    (StadtzhLosdDcatProfile, "_object_value"),
+    (StadtzhLosdDcatProfile, "_object_value_list"),
+    (StadtzhLosdDcatProfile, "_object_value_from_losd_predicate"),
+    (StadtzhLosdDcatProfile, "_keywords"),
+    (profiles, "md"),
+)
+
+
+class CallStats(object):
+    """Accumulated wall time and memory allocation of one profiled callable."""
+
+    __slots__ = ("name", "calls", "total_time", "max_time", "allocated")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.allocated = 0
+
+
+class LosdProfiler(object):
+    """
+    Records the wall time and the tracemalloc allocation delta of every call to
+    the callables in PROFILED_CALLABLES.
+
+    The callables are only wrapped while the profiler is active, i.e. inside a
+    `with LosdProfiler():` block, so there is no overhead when it is not used.
+    """
+
+    def __init__(self, top_n=DEFAULT_TOP_N):
+        self.top_n = top_n
+        self.stats = {}
+        self._originals = []
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        try:
+            for owner, attr_name in PROFILED_CALLABLES:
+                # Inherited methods are wrapped on the subclass, and removed from
+                # it again afterwards.
+                own_attr = attr_name in vars(owner)
+                original = getattr(owner, attr_name)
+                setattr(owner, attr_name, self._wrap(original, attr_name))
+                self._originals.append((owner, attr_name, original, own_attr))
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for owner, attr_name, original, own_attr in reversed(self._originals):
+            if own_attr:
+                setattr(owner, attr_name, original)
+            else:
+                delattr(owner, attr_name)
+        self._originals = []
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _wrap(self, func, name):
+        stats = self.stats.setdefault(name, CallStats(name))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            memory_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats.calls += 1
+                stats.total_time += elapsed
+                stats.max_time = max(stats.max_time, elapsed)
+                stats.allocated += tracemalloc.get_traced_memory()[0] - memory_before
+
+        return wrapper
+
+    def report(self):
+        """Return the top N callables by total wall time as a printable table.
+        Times of nested calls are included in the times of their callers.
+        """
+        lines = [
+            f"{'callable':<36} {'calls':>8} {'total s':>10} {'max s':>10} "
+            f"{'alloc KiB':>12}"
+        ]
+        stats = sorted(self.stats.values(), key=lambda s: s.total_time, reverse=True)
+        for item in stats[: self.top_n]:
+            if not item.calls:
+                continue
+            lines.append(
+                f"{item.name:<36} {item.calls:>8} {item.total_time:>10.3f} "
+                f"{item.max_time:>10.3f} {item.allocated / 1024:>12.1f}"
+            )
+
+        return "\n".join(lines)
@@ -1,5 +1,85 @@
 """Tests for harvester.py."""
 
+import json
+from unittest import mock
+
+import ckan.model as model
+import pytest
+
+from ckanext.dcat.harvesters.rdf import DCATRDFHarvester
+from ckanext.harvest.model import HarvestObject
+from ckanext.harvest.tests import factories as harvest_factories
+from ckanext.stadtzh_losdharvest.harvester import StadtzhLosdHarvester
+from ckanext.stadtzh_losdharvest.utils import compact_payload
+
 
 def test_harvester():
     pass
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"profiling": "yes"},
+        {"profiling_top_n": True},
+        {"profiling_top_n": 0},
+        {"profiling_top_n": -5},
+        {"profiling_top_n": "20"},
+    ],
+)
+def test_validate_config_rejects_invalid_profiling_config(config):
+    with pytest.raises(ValueError):
+        StadtzhLosdHarvester().validate_config(json.dumps(config))
+
+
+def test_validate_config_accepts_profiling_config():
+    config = {"profiling": True, "profiling_top_n": 10}
+
+    validated = json.loads(StadtzhLosdHarvester().validate_config(json.dumps(config)))
+
+    assert validated["profiling_top_n"] == 10
+
+
+def _get_content_from_db(harvest_object_id):
+    model.Session.expire_all()
+    return model.Session.query(HarvestObject).get(harvest_object_id).content
+
+
+@pytest.mark.usefixtures("with_plugins", "clean_db")
+def test_gather_stage_compacts_content_of_own_job():
+    content = json.dumps({"name": "bev324od3242"})
+    harvest_job = harvest_factories.HarvestJobObj()
+    other_job = harvest_factories.HarvestJobObj()
+
+    def gather_stage(self, job):
+        object_ids = []
+        for guid, obj_job in (("bev324od3242", job), ("bev324od3243", other_job)):
+            obj = HarvestObject(guid=guid, job=obj_job, content=content)
+            obj.save()
+            object_ids.append(obj.id)
+        return object_ids
+
+    with mock.patch.object(DCATRDFHarvester, "gather_stage", gather_stage):
+        object_ids = StadtzhLosdHarvester().gather_stage(harvest_job)
+
+    assert _get_content_from_db(object_ids[0]) == compact_payload(content)
+    assert _get_content_from_db(object_ids[1]) == content
+
+
+@pytest.mark.usefixtures("with_plugins", "clean_db")
+def test_import_stage_expands_content_without_writing_it_back():
+    content = json.dumps({"name": "bev324od3242"})
+    harvest_object = harvest_factories.HarvestObjectObj(
+        guid="bev324od3242", content=compact_payload(content)
+    )
+
+    def import_stage(self, obj):
+        assert obj.content == content
+        obj.current = True
+        model.Session.commit()
+        return True
+
+    with mock.patch.object(DCATRDFHarvester, "import_stage", import_stage):
+        assert StadtzhLosdHarvester().import_stage(harvest_object)
+
+    assert _get_content_from_db(harvest_object.id) == compact_payload(content)
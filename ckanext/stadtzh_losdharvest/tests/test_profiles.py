@@ -0,0 +1,146 @@
+"""Tests for profiles.py."""
+
+import rdflib
+from rdflib.namespace import RDF, RDFS
+
+from ckanext.stadtzh_losdharvest.profiles import (
+    DCAT,
+    DCTERMS_FORMAT,
+    StadtzhLosdDcatProfile,
+)
+
+DATASET_REF = rdflib.URIRef("https://ld.stadt-zuerich.ch/statistics/view/BEV324OD3242")
+OTHER_DATASET_REF = rdflib.URIRef(
+    "https://ld.stadt-zuerich.ch/statistics/view/BEV324OD3243"
+)
+CSV_FORMAT_REF = rdflib.URIRef(
+    "http://publications.europa.eu/resource/authority/file-type/CSV"
+)
+
+
+def _add_distribution(graph, dataset_ref, url, media_type=None, file_format=None):
+    distribution_ref = rdflib.BNode()
+    graph.add((dataset_ref, DCAT.distribution, distribution_ref))
+    graph.add((distribution_ref, RDF.type, DCAT.Distribution))
+    graph.add((distribution_ref, DCAT.downloadURL, rdflib.URIRef(url)))
+    if media_type:
+        graph.add((distribution_ref, DCAT.mediaType, rdflib.Literal(media_type)))
+    if file_format:
+        graph.add((distribution_ref, DCTERMS_FORMAT, file_format))
+
+
+def _get_sample_graph():
+    graph = rdflib.ConjunctiveGraph()
+    graph.add((CSV_FORMAT_REF, RDFS.label, rdflib.Literal("CSV")))
+    _add_distribution(
+        graph,
+        DATASET_REF,
+        "https://ld.stadt-zuerich.ch/statistics/view/BEV324OD3242/observation?format=csv",
+        media_type="text/csv",
+        file_format=CSV_FORMAT_REF,
+    )
+    _add_distribution(
+        graph,
+        DATASET_REF,
+        "https://ld.stadt-zuerich.ch/query",
+        media_type="application/sparql-query",
+        file_format=rdflib.Literal("SPARQL"),
+    )
+    _add_distribution(graph, DATASET_REF, "https://ld.stadt-zuerich.ch/")
+    _add_distribution(
+        graph,
+        OTHER_DATASET_REF,
+        "https://ld.stadt-zuerich.ch/statistics/view/BEV324OD3243/observation?format=csv",
+        media_type="text/csv",
+    )
+    return graph
+
+
+def _build_resources_dict_per_distribution(profile, dataset_ref, dataset_dict):
+    """The resources as they were built before the distribution index."""
+    resource_list = []
+    for resource_ref in profile.g.objects(dataset_ref, DCAT.distribution):
+        resource_dict = {}
+        for key, predicate in (
+            ("url", DCAT.downloadURL),
+            ("uri", DCAT.downloadURL),
+            ("format", DCTERMS_FORMAT),
+            ("mimetype", DCAT.mediaType),
+        ):
+            value = profile._object_value(resource_ref, predicate)
+            if value:
+                resource_dict[key] = value
+        resource_dict["name"] = dataset_dict["name"]
+
+        if "csv" in resource_dict.get("mimetype", ""):
+            resource_dict["url_type"] = "file"
+            resource_dict["resource_type"] = "file"
+        else:
+            resource_dict["url_type"] = "api"
+            resource_dict["resource_type"] = "api"
+
+        resource_list.append(resource_dict)
+
+    return resource_list
+
+
+def _sort_by_url(resources):
+    return sorted(resources, key=lambda resource: resource["url"])
+
+
+def test_build_resources_dict_matches_per_distribution_lookup():
+    profile = StadtzhLosdDcatProfile(_get_sample_graph())
+
+    for dataset_ref, name in (
+        (DATASET_REF, "bev324od3242"),
+        (OTHER_DATASET_REF, "bev324od3243"),
+    ):
+        dataset_dict = {"name": name}
+        resources = profile._build_resources_dict(dataset_ref, dataset_dict)
+        expected = _build_resources_dict_per_distribution(
+            profile, dataset_ref, dataset_dict
+        )
+
+        assert _sort_by_url(resources) == _sort_by_url(expected)
+
+
+def test_build_resources_dict():
+    profile = StadtzhLosdDcatProfile(_get_sample_graph())
+
+    resources = _sort_by_url(
+        profile._build_resources_dict(DATASET_REF, {"name": "bev324od3242"})
+    )
+
+    assert [
+        (r.get("format"), r["url_type"], r["resource_type"]) for r in resources
+    ] == [
+        (None, "api", "api"),
+        ("SPARQL", "api", "api"),
+        ("CSV", "file", "file"),
+    ]
+    assert all(r["uri"] == r["url"] for r in resources)
+    assert all(r["name"] == "bev324od3242" for r in resources)
+
+
+def test_distribution_index_is_rebuilt_when_graph_changes():
+    graph = _get_sample_graph()
+    profile = StadtzhLosdDcatProfile(graph)
+    assert len(profile._build_resources_dict(OTHER_DATASET_REF, {"name": "a"})) == 1
+
+    _add_distribution(graph, OTHER_DATASET_REF, "https://ld.stadt-zuerich.ch/query")
+
+    assert len(profile._build_resources_dict(OTHER_DATASET_REF, {"name": "a"})) == 2
+
+
+def test_distribution_index_is_kept_per_graph_instance():
+    graph = _get_sample_graph()
+    other_graph = rdflib.ConjunctiveGraph(identifier=graph.identifier)
+
+    StadtzhLosdDcatProfile(graph)._build_resources_dict(DATASET_REF, {"name": "a"})
+
+    assert (
+        StadtzhLosdDcatProfile(other_graph)._build_resources_dict(
+            DATASET_REF, {"name": "a"}
+        )
+        == []
+    )
@@ -0,0 +1,89 @@
+"""Tests for profiling.py."""
+
+import tracemalloc
+
+import rdflib
+
+from ckanext.stadtzh_losdharvest import profiles
+from ckanext.stadtzh_losdharvest.profiles import SCHEMA, StadtzhLosdDcatProfile
+from ckanext.stadtzh_losdharvest.profiling import (
+    PROFILED_CALLABLES,
+    LosdProfiler,
+)
+
+DATASET_REF = rdflib.URIRef("https://ld.stadt-zuerich.ch/statistics/view/BEV324OD3242")
+
+
+def _get_callables():
+    return {
+        (owner, attr_name): (attr_name in vars(owner), getattr(owner, attr_name))
+        for owner, attr_name in PROFILED_CALLABLES
+    }
+
+
+def test_profiler_restores_callables():
+    callables = _get_callables()
+    md = profiles.md
+
+    with LosdProfiler():
+        assert profiles.md is not md
+        assert "_object_value" in vars(StadtzhLosdDcatProfile)
+
+    assert _get_callables() == callables
+    assert profiles.md is md
+    assert "_object_value" not in vars(StadtzhLosdDcatProfile)
+
+
+def test_profiler_restores_callables_on_error():
+    callables = _get_callables()
+
+    try:
+        with LosdProfiler():
+            raise RuntimeError("Error while parsing")
+    except RuntimeError:
+        pass
+
+    assert _get_callables() == callables
+
+
+def test_profiler_counts_calls():
+    graph = rdflib.ConjunctiveGraph()
+    graph.add((DATASET_REF, SCHEMA.name, rdflib.Literal("Bevölkerung")))
+
+    with LosdProfiler() as profiler:
+        profile = StadtzhLosdDcatProfile(graph)
+        for _ in range(3):
+            profile._object_value(DATASET_REF, SCHEMA.name)
+        profiles.md("<b>Bevölkerung</b>")
+
+    assert profiler.stats["_object_value"].calls == 3
+    assert profiler.stats["md"].calls == 1
+    assert profiler.stats["parse_dataset"].calls == 0
+    assert "_object_value" in profiler.report()
+    assert "parse_dataset" not in profiler.report()
+
+
+def test_profiler_report_is_limited_to_top_n():
+    graph = rdflib.ConjunctiveGraph()
+
+    with LosdProfiler(top_n=1) as profiler:
+        profile = StadtzhLosdDcatProfile(graph)
+        profile._object_value(DATASET_REF, SCHEMA.name)
+        profiles.md("<b>Bevölkerung</b>")
+
+    assert len(profiler.report().splitlines()) == 2
+
+
+def test_profiler_stops_tracemalloc_only_if_started_by_it():
+    assert not tracemalloc.is_tracing()
+    with LosdProfiler():
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        with LosdProfiler():
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,41 @@
+"""Tests for utils.py."""
+
+import json
+
+from ckanext.stadtzh_losdharvest.utils import (
+    COMPACT_PAYLOAD_PREFIX,
+    compact_payload,
+    expand_payload,
+)
+
+
+def test_compact_payload_round_trip():
+    dataset = {
+        "name": "bev324od3242",
+        "notes": "Wirtschaftliche Bevölkerung " * 100,
+        "resources": [{"url": "https://ld.stadt-zuerich.ch/", "format": "CSV"}],
+    }
+    content = json.dumps(dataset)
+
+    compacted = compact_payload(content)
+
+    assert compacted.startswith(COMPACT_PAYLOAD_PREFIX)
+    assert len(compacted) < len(content)
+    assert json.loads(expand_payload(compacted)) == dataset
+
+
+def test_compact_payload_is_not_applied_twice():
+    compacted = compact_payload(json.dumps({"name": "bev324od3242"}))
+
+    assert compact_payload(compacted) == compacted
+
+
+def test_expand_payload_passes_through_legacy_content():
+    content = json.dumps({"name": "bev324od3242"})
+
+    assert expand_payload(content) == content
+
+
+def test_payload_none():
+    assert compact_payload(None) is None
+    assert expand_payload(None) is None
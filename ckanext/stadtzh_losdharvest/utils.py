@@ -1,4 +1,6 @@
+import base64
 import logging
+import zlib
 
 import requests
 
@@ -8,6 +10,7 @@ MAX_FILE_SIZE = 1024 * 1024 * 50  # 50 Mb
 CHUNK_SIZE = 1024
 RDF_PROFILES_CONFIG_OPTION = "ckanext.dcat.rdf.profiles"
 TIMEOUT_SECONDS = 15
+COMPACT_PAYLOAD_PREFIX = "zlib+b64:"
 
 
 def get_content_and_type(url, content_type=None):
@@ -84,3 +87,41 @@ def make_head_request(url, session):
         raise RuntimeError(msg)
 
     return r, did_get
+
+
+def compact_payload(content):
+    """
+    Compress the JSON content of a harvest object so that it takes up less
+    space in the harvest tables.
+
+    :param content: the JSON string of a dataset dict
+    :return: the compressed content, prefixed with COMPACT_PAYLOAD_PREFIX
+    """
+    if content is None or is_compact_payload(content):
+        return content
+
+    data = content.encode("utf-8")
+    encoded = base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+    return f"{COMPACT_PAYLOAD_PREFIX}{encoded}"
+
+
+def expand_payload(content):
+    """
+    Expand harvest object content created by compact_payload. Content that has
+    not been compacted (e.g. from harvest jobs run before compaction was
+    introduced) is returned unchanged.
+
+    :param content: the content of a harvest object
+    :return: the JSON string of a dataset dict
+    """
+    if not is_compact_payload(content):
+        return content
+
+    encoded = content.split(":", 1)[1]
+
+    return zlib.decompress(base64.b64decode(encoded)).decode("utf-8")
+
+
+def is_compact_payload(content):
+    return content is not None and content.startswith(COMPACT_PAYLOAD_PREFIX)